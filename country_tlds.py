@@ -1,4 +1,4 @@
-country_language_tlds = {
+country_language_tlds = frozenset({
     "ac", "ad", "ae", "af", "ag", "ai", "al", "am", "ao", "ar", "as", "at", "au", "aw", "ax", "az",
     "ba", "bb", "bd", "be", "bf", "bg", "bh", "bi", "bj", "bm", "bn", "bo", "br", "bs", "bt", "bw", "by", "bz",
     "ca", "cc", "cd", "cf", "cg", "ch", "ci", "ck", "cl", "cm", "cn", "co", "cr", "cu", "cv", "cy", "cz",
@@ -24,4 +24,9 @@ country_language_tlds = {
     "wf", "ws",
     "ye", "yt",
     "za", "zm", "zw"
-}
\ No newline at end of file
+})
+
+# Generic labels registered under country TLDs, as in co.uk or com.au
+second_level_domains = frozenset({
+    "ac", "co", "com", "edu", "gob", "gov", "govt", "ne", "net", "or", "org"
+})
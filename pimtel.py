@@ -1,25 +1,79 @@
 import platform
+import sys
 import locale
 import subprocess
 import pycountry
 import os
 import json
+import pickle
+import mmap
 import re
 import sqlite3
 import shutil
+import tempfile
 import re
+from functools import lru_cache
 
-from country_tlds import country_language_tlds
+from country_tlds import country_language_tlds, second_level_domains
+
+_LANG_RE = re.compile(rb'"Language"\s+"(\w+)"')
+_ACCEPT_LANGUAGES_PREF_RE = re.compile(rb'intl\.accept_languages"\s*,\s*"([^"]+)"')
+
+_SCRIPT_RANGES = (
+    ('Cyrillic', 0x0400, 0x04FF),
+    ('Arabic', 0x0600, 0x06FF),
+    ('Chinese', 0x4E00, 0x9FFF),
+    ('Greek', 0x0370, 0x03FF),
+    ('Hebrew', 0x0590, 0x05FF),
+    ('Devanagari', 0x0900, 0x097F),
+    ('Thai', 0x0E00, 0x0E7F),
+    ('Hangul', 0xAC00, 0xD7AF),
+)
+_ALL_SCRIPTS_MASK = (1 << len(_SCRIPT_RANGES)) - 1
+
+# Script names for every possible bitmask, so a mask is unpacked with one lookup
+_MASK_LANGUAGES = tuple(
+    tuple(name for i, (name, _, _) in enumerate(_SCRIPT_RANGES) if mask >> i & 1)
+    for mask in range(_ALL_SCRIPTS_MASK + 1)
+)
+
+# One character class covering every script range, so a text is scanned once.
+# Runs of consecutive script characters are matched together.
+_SCRIPT_RUNS_RE = re.compile('[%s]+' % ''.join(
+    '%s-%s' % (chr(low), chr(high)) for _, low, high in _SCRIPT_RANGES))
+
+
+def _script_mask(run):
+    """
+    Classify a run of script characters into a bitmask of the scripts in _SCRIPT_RANGES.
+    """
+    # Most runs stay within one script, so check the run's bounds first
+    first, last = ord(min(run)), ord(max(run))
+    for i, (_, low, high) in enumerate(_SCRIPT_RANGES):
+        if low <= first and last <= high:
+            return 1 << i
+
+    mask = 0
+    for char in set(run):
+        code = ord(char)
+        for i, (_, low, high) in enumerate(_SCRIPT_RANGES):
+            if low <= code <= high:
+                mask |= 1 << i
+                break
+    return mask
 
 
 def run_command(command):
     """
-    Runs a shell command and returns the output.
+    Runs a command directly, without a shell, and returns the output.
+
+    Args:
+        command (list): The program and its arguments.
     """
     try:
-        result = subprocess.check_output(command, shell=True, stderr=subprocess.DEVNULL).decode().strip()
+        result = subprocess.run(command, capture_output=True, text=True, check=True).stdout.strip()
         return result if result else None
-    except subprocess.CalledProcessError:
+    except (subprocess.CalledProcessError, OSError):
         return None
 
 def get_windows_language():
@@ -42,18 +96,18 @@ def get_windows_keyboard_layouts():
     Returns:
         list: A list of installed keyboard layouts.
     """
-    from winreg import OpenKey, EnumKey, QueryValueEx, HKEY_LOCAL_MACHINE
+    from winreg import OpenKey, EnumKey, QueryInfoKey, QueryValueEx, HKEY_LOCAL_MACHINE
 
     layouts = []
-    key = OpenKey(HKEY_LOCAL_MACHINE, r'SYSTEM\CurrentControlSet\Control\Keyboard Layouts')
-    for i in range(0, 256):
-        try:
-            layout_key = EnumKey(key, i)
-            with OpenKey(key, layout_key) as subkey:
-                layout_text, _ = QueryValueEx(subkey, 'Layout Text')
+    with OpenKey(HKEY_LOCAL_MACHINE, r'SYSTEM\CurrentControlSet\Control\Keyboard Layouts') as key:
+        num_subkeys, _, _ = QueryInfoKey(key)
+        for i in range(num_subkeys):
+            with OpenKey(key, EnumKey(key, i)) as subkey:
+                try:
+                    layout_text, _ = QueryValueEx(subkey, 'Layout Text')
+                except FileNotFoundError:
+                    continue
                 layouts.append(layout_text)
-        except OSError:
-            break
 
     return layouts
 
@@ -73,9 +127,11 @@ def get_linux_keyboard_layout():
     Returns:
         str: The keyboard layout.
     """
-    keyboard_layout = run_command("setxkbmap -query | grep layout")
-    if keyboard_layout:
-        return keyboard_layout.split(':')[1].strip()
+    keyboard_settings = run_command(["setxkbmap", "-query"])
+    if keyboard_settings:
+        for line in keyboard_settings.splitlines():
+            if line.startswith('layout:'):
+                return line.split(':', 1)[1].strip()
     return "Unknown"
 
 def get_linux_installed_languages():
@@ -85,11 +141,19 @@ def get_linux_installed_languages():
     Returns:
         list: A list of installed languages.
     """
-    installed_languages = run_command("locale -a")
+    installed_languages = run_command(["locale", "-a"])
     if installed_languages:
         return installed_languages.split('\n')
     return []
 
+@lru_cache(maxsize=None)
+def _language_name(lang):
+    """
+    Look up the name of an ISO 639-1 language code, or None if it is unknown.
+    """
+    language = pycountry.languages.get(alpha_2=lang)
+    return language.name if language else None
+
 def get_human_readable_languages(language_codes):
     """
     Convert locale language codes to human-readable language names.
@@ -100,38 +164,57 @@ def get_human_readable_languages(language_codes):
     Returns:
         list: List of human-readable language names.
     """
-    human_readable_languages = set()
-    for code in language_codes:
-        lang = code.split('_')[0]  # Extract the language part
-        try:
-            language = pycountry.languages.get(alpha_2=lang)
-            if language:
-                human_readable_languages.add(language.name)
-        except KeyError:
-            continue
+    # Extract the language part of each distinct code
+    human_readable_languages = {_language_name(code.split('_', 1)[0]) for code in set(language_codes)}
+    human_readable_languages.discard(None)
     return list(human_readable_languages)
 
-def get_firefox_languages():
+def _iter_firefox_profiles():
+    """
+    Yield the prefs.js and places.sqlite paths of every Firefox profile.
+
+    Returns:
+        iterator: Tuples of (prefs_js_path, places_db_path).
+    """
+    firefox_profiles_path = os.path.expanduser("~/.mozilla/firefox")
+
+    try:
+        with os.scandir(firefox_profiles_path) as profiles:
+            profile_paths = [profile.path for profile in profiles if profile.is_dir()]
+    except FileNotFoundError:
+        return
+
+    for profile_path in profile_paths:
+        yield os.path.join(profile_path, "prefs.js"), os.path.join(profile_path, "places.sqlite")
+
+def get_firefox_languages(firefox_profiles=None):
     """
     Retrieve the installed languages for Firefox.
 
+    Args:
+        firefox_profiles (list, optional): Profile paths from _iter_firefox_profiles,
+            to share one profile scan between callers.
+
     Returns:
         list: A list of installed languages.
     """
-    firefox_profiles_path = os.path.expanduser("~/.mozilla/firefox")
+    if firefox_profiles is None:
+        firefox_profiles = _iter_firefox_profiles()
     languages = set()
-    
-    if not os.path.exists(firefox_profiles_path):
-        return []
 
-    for profile in os.listdir(firefox_profiles_path):
-        prefs_js_path = os.path.join(firefox_profiles_path, profile, "prefs.js")
-        if os.path.isfile(prefs_js_path):
-            with open(prefs_js_path, 'r') as prefs_js_file:
-                for line in prefs_js_file:
-                    if 'intl.accept_languages' in line:
-                        lang_code = line.split('"')[1]
-                        languages.update(lang_code.split(','))
+    for prefs_js_path, _ in firefox_profiles:
+        try:
+            prefs_js_file = open(prefs_js_path, 'rb')
+        except FileNotFoundError:
+            continue
+        with prefs_js_file:
+            if os.fstat(prefs_js_file.fileno()).st_size == 0:
+                continue  # mmap cannot map an empty file
+            with mmap.mmap(prefs_js_file.fileno(), 0, access=mmap.ACCESS_READ) as prefs_js:
+                pref_match = _ACCEPT_LANGUAGES_PREF_RE.search(prefs_js)
+                if pref_match:
+                    lang_codes = pref_match.group(1).decode()
+                    languages.update(lang.strip() for lang in lang_codes.split(','))
     return list(languages)
 
 def get_chrome_languages():
@@ -144,20 +227,28 @@ def get_chrome_languages():
     chrome_profile_path = os.path.expanduser("~/.config/google-chrome")
     languages = set()
 
-    if not os.path.exists(chrome_profile_path):
+    try:
+        with os.scandir(chrome_profile_path) as profiles:
+            preferences_paths = [os.path.join(profile.path, "Preferences") for profile in profiles if profile.is_dir()]
+    except FileNotFoundError:
         return []
 
-    for profile in os.listdir(chrome_profile_path):
-        preferences_path = os.path.join(chrome_profile_path, profile, "Preferences")
-        if os.path.isfile(preferences_path):
-            with open(preferences_path, 'r') as preferences_file:
-                try:
-                    preferences = json.load(preferences_file)
-                    language = preferences.get('intl', {}).get('accept_languages', '')
-                    if language:
-                        languages.update(language.split(','))
-                except json.JSONDecodeError:
-                    continue
+    for preferences_path in preferences_paths:
+        try:
+            with open(preferences_path, 'rb') as preferences_file:
+                preferences_data = preferences_file.read()
+        except FileNotFoundError:
+            continue
+        # Only decode the (often large) JSON when it can hold the setting
+        if b'"accept_languages"' not in preferences_data:
+            continue
+        try:
+            preferences = json.loads(preferences_data)
+        except json.JSONDecodeError:
+            continue
+        language = preferences.get('intl', {}).get('accept_languages', '')
+        if language:
+            languages.update(language.split(','))
     return list(languages)
 
 def get_ie_languages():
@@ -167,17 +258,13 @@ def get_ie_languages():
     Returns:
         list: A list of installed languages.
     """
-    from winreg import OpenKey, EnumValue, HKEY_CURRENT_USER
+    from winreg import OpenKey, EnumValue, QueryInfoKey, HKEY_CURRENT_USER
     languages = []
     try:
         with OpenKey(HKEY_CURRENT_USER, r'Software\Microsoft\Internet Explorer\International\AcceptLanguage') as key:
-            i = 0
-            while True:
-                try:
-                    languages.append(EnumValue(key, i)[1])
-                    i += 1
-                except OSError:
-                    break
+            _, num_values, _ = QueryInfoKey(key)
+            for i in range(num_values):
+                languages.append(EnumValue(key, i)[1])
     except FileNotFoundError:
         pass
     return languages
@@ -206,49 +293,185 @@ def get_steam_language(os_name):
     if not os.path.exists(steam_config_path):
         return None
 
-    with open(steam_config_path, 'r', encoding='utf-8') as file:
-        config_content = file.read()
-
-    language_match = re.search(r'"Language"\s+"(\w+)"', config_content)
-    if language_match:
-        return language_match.group(1)
-    else:
-        return None
+    # Stream the file and stop at the first match instead of reading it whole
+    with open(steam_config_path, 'rb', buffering=65536) as file:
+        for line in file:
+            language_match = _LANG_RE.search(line)
+            if language_match:
+                return language_match.group(1).decode()
+    return None
 
+from bisect import bisect_right
 from collections import defaultdict, Counter
+from concurrent.futures import ThreadPoolExecutor
+from itertools import accumulate
+from pathlib import Path
 
-from collections import defaultdict, Counter
-from urllib.parse import urlparse
+# SQLite's default limit on databases attached to one connection
+_SQLITE_MAX_ATTACHED = 10
+# Files next to an SQLite database that may hold changes not yet in the database itself
+_SQLITE_JOURNAL_SUFFIXES = ("-wal", "-journal")
 
-def get_base_domain(url):
+def _readonly_uri(db_path):
     """
-    Extract the base domain from a full URL.
-    
+    Build an SQLite URI that opens a database read-only, without taking locks
+    when that is safe.
+
     Args:
-        url (str): The full URL.
-        
+        db_path (str): The path to the database file.
+
     Returns:
-        str: The base domain.
+        str: The database URI.
     """
-    parsed_url = urlparse(url)
-    domain_parts = parsed_url.netloc.split('.')
-    if len(domain_parts) > 2:
-        base_domain = '.'.join(domain_parts[-2:])
-    else:
-        base_domain = parsed_url.netloc
-    return base_domain
+    uri = Path(db_path).as_uri() + "?mode=ro"
+    # immutable also makes SQLite ignore a write-ahead log or rollback journal,
+    # so only use it when neither exists
+    if not any(os.path.exists(db_path + suffix) for suffix in _SQLITE_JOURNAL_SUFFIXES):
+        uri += "&immutable=1"
+    return uri
 
-def get_tld_from_domain(domain):
+def _copy_database(db_path, copy_dir):
     """
-    Extract the TLD from a base domain.
-    
+    Copy an SQLite database, with its write-ahead log or journal, into a directory.
+
     Args:
-        domain (str): The base domain.
-        
+        db_path (str): The path to the database file.
+        copy_dir (str): The directory to copy into.
+
     Returns:
-        str: The TLD.
+        str: The path to the copied database.
+    """
+    copy_path = os.path.join(copy_dir, os.path.basename(db_path))
+    shutil.copy2(db_path, copy_path)
+    for suffix in _SQLITE_JOURNAL_SUFFIXES:
+        if os.path.exists(db_path + suffix):
+            shutil.copy2(db_path + suffix, copy_path + suffix)
+    return copy_path
+
+def _connect_readonly(db_path):
     """
-    return domain.split('.')[-1]
+    Open an SQLite database read-only, without copying it.
+
+    Args:
+        db_path (str): The path to the database file.
+
+    Returns:
+        sqlite3.Connection: The database connection.
+    """
+    conn = sqlite3.connect(_readonly_uri(db_path), uri=True)
+    conn.execute("PRAGMA query_only=1")
+    return conn
+
+_CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "pimtel")
+# Set PIMTEL_NO_CACHE to any non-empty value to never read or write the history cache
+_CACHE_DISABLED = bool(os.environ.get("PIMTEL_NO_CACHE"))
+# Bump whenever the history summary changes, so summaries from older versions are not reused
+_CACHE_VERSION = 2
+
+def _cached_history_data(browser, db_paths, compute):
+    """
+    Return a browser's history summary from the on-disk cache, recomputing it
+    only when one of its databases changed.
+
+    Args:
+        browser (str): The browser name, used to name the cache file.
+        db_paths (list): Paths of the history databases the summary is built from.
+        compute (callable): Builds the summary when the cache is missing or stale, and
+            returns it with a flag telling whether every database could be read.
+
+    Returns:
+        dict: The history summary, as returned by filter_non_com_urls.
+    """
+    if _CACHE_DISABLED:
+        return compute()[0]
+
+    cache_key = [_CACHE_VERSION]
+    for db_path in db_paths:
+        # A write-ahead log holds changes that are not in the database file yet
+        for path in (db_path, db_path + "-wal"):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            cache_key.append((path, stat.st_mtime_ns, stat.st_size))
+
+    cache_path = os.path.join(_CACHE_DIR, f"{browser}_history.pkl")
+    try:
+        with open(cache_path, 'rb') as cache_file:
+            cached_key, history_data = pickle.load(cache_file)
+        if cached_key == cache_key:
+            return history_data
+    except Exception:
+        pass  # a missing or corrupt cache is recomputed; unpickling bad data can raise almost anything
+
+    history_data, complete = compute()
+    if not complete:
+        # Caching a summary with a database missing would hide it until the next change
+        return history_data
+
+    cache_file = None
+    try:
+        os.makedirs(_CACHE_DIR, exist_ok=True)
+        # Write to a temporary file first, so a concurrent run never reads a partial cache
+        with tempfile.NamedTemporaryFile('wb', dir=_CACHE_DIR, delete=False) as cache_file:
+            pickle.dump((cache_key, history_data), cache_file, protocol=5)
+        os.replace(cache_file.name, cache_path)
+    except (OSError, pickle.PicklingError):
+        if cache_file is not None:
+            try:
+                os.remove(cache_file.name)
+            except OSError:
+                pass
+    return history_data
+
+def _url_host(url):
+    """
+    Extract the host of a URL, without userinfo or port.
+
+    Args:
+        url (str): The full URL.
+
+    Returns:
+        str: The host, or an empty string if the URL has none.
+    """
+    # Slice the host out by hand; a full urlsplit costs far more per URL
+    start = url.find('://')
+    if start < 0 or not url[:start].isalpha():
+        return ''  # no host, as in mailto: or about: URLs
+    start += 3
+    end = len(url)
+    for delimiter in '/?#':
+        index = url.find(delimiter, start, end)
+        if index >= 0:
+            end = index
+    host = url[start:end].rpartition('@')[2]
+    port = host.rfind(':')
+    if port >= 0 and ']' not in host[port:]:
+        host = host[:port]
+    return host
+
+def _split_host(host):
+    """
+    Split a host into its TLD and base domain.
+
+    Args:
+        host (str): The host, as returned by _url_host.
+
+    Returns:
+        tuple: The TLD and the base domain.
+    """
+    rest, _, tld = host.rpartition('.')
+    rest, _, second_level = rest.rpartition('.')
+    if not second_level:
+        return tld, host
+    base_domain = second_level + '.' + tld
+    # Country suffixes such as co.uk or com.au take one more label,
+    # but not www, so www.gov.uk still reports gov.uk
+    if rest and second_level in second_level_domains:
+        label = rest.rpartition('.')[2]
+        if label != 'www':
+            base_domain = label + '.' + base_domain
+    return tld, base_domain
 
 def filter_non_com_urls(history_entries):
     """
@@ -256,28 +479,28 @@ def filter_non_com_urls(history_entries):
     counts the occurrences of each TLD, and records the most common base URLs.
 
     Args:
-        history_entries (list): List of dictionaries with history entries.
+        history_entries (iterable): Dictionaries with history entries.
 
     Returns:
         dict: Dictionary with TLDs as keys and another dictionary as values, 
               containing the count and most common base URLs.
     """
-    tld_data = defaultdict(lambda: {"count": 0, "urls": []})
+    # Count base URLs as they come in, so memory grows with distinct domains only
+    tld_data = defaultdict(lambda: {"count": 0, "urls": Counter()})
 
     for entry in history_entries:
-        base_domain = get_base_domain(entry['url'])
-        tld = get_tld_from_domain(base_domain)
-        if tld in country_language_tlds:
-            tld_data[tld]["count"] += 1
-            tld_data[tld]["urls"].append(base_domain)
+        host = _url_host(entry['url'])
+        tld, base_domain = _split_host(host)
+        if tld not in country_language_tlds:
+            continue
+        tld_data[tld]["count"] += 1
+        tld_data[tld]["urls"][base_domain] += 1
 
     # Keep only the 3 most common base URLs for each TLD
-    for tld, data in tld_data.items():
-        url_counts = Counter(data["urls"])
-        most_common_urls = [url for url, _ in url_counts.most_common(3)]
-        tld_data[tld]["urls"] = most_common_urls
+    for data in tld_data.values():
+        data["urls"] = [url for url, _ in data["urls"].most_common(3)]
 
-    return tld_data
+    return dict(tld_data)
 
 
 
@@ -288,25 +511,21 @@ def get_ie_history():
     Returns:
         list: A list of search history entries.
     """
-    from winreg import OpenKey, EnumValue, HKEY_CURRENT_USER
+    from winreg import OpenKey, EnumValue, QueryInfoKey, HKEY_CURRENT_USER
     history_entries = []
 
     def read_ie_history(key):
         try:
             with OpenKey(HKEY_CURRENT_USER, key) as regkey:
-                i = 0
-                while True:
-                    try:
-                        name, value, _ = EnumValue(regkey, i)
-                        if name.startswith("url"):
-                            history_entries.append({
-                                "url": value,
-                                "title": "",
-                                "visit_date": ""
-                            })
-                        i += 1
-                    except OSError:
-                        break
+                _, num_values, _ = QueryInfoKey(regkey)
+                for i in range(num_values):
+                    name, value, _ = EnumValue(regkey, i)
+                    if name.startswith("url"):
+                        history_entries.append({
+                            "url": value,
+                            "title": "",
+                            "visit_date": ""
+                        })
         except FileNotFoundError:
             pass
 
@@ -320,120 +539,219 @@ def get_ie_history():
 
     return filter_non_com_urls(history_entries)
 
+def _run_collector(default, collector, *args):
+    """
+    Run one data collector, reporting a failure on stderr instead of raising it,
+    so one broken source does not hide the rest of the report.
+
+    Args:
+        default: The value to use when the collector fails.
+        collector (callable): The data collector to run.
+        *args: Arguments for the collector.
+
+    Returns:
+        The collector's result, or the default when it failed.
+    """
+    try:
+        return collector(*args)
+    except Exception as error:
+        sys.stderr.write(f"Could not run {collector.__name__}: {error}\n")
+        return default
+
 def print_windows_settings():
     """
     Print language and keyboard settings for Windows.
     """
-    lang_code = get_windows_language()
-    keyboard_layouts = get_windows_keyboard_layouts()
-    installed_languages = [lang_code]
-    ie_languages = get_ie_languages()
-    steam_language = get_steam_language("Windows")
-
-    print(f"Operating System: Windows")
-    print(f"Language Code: {lang_code}")
-    print("Installed Keyboard Layouts:")
+    # the collectors are independent and mostly wait on I/O, so run them side by side
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [
+            executor.submit(_run_collector, None, get_windows_language),
+            executor.submit(_run_collector, [], get_windows_keyboard_layouts),
+            executor.submit(_run_collector, [], get_ie_languages),
+            executor.submit(_run_collector, None, get_steam_language, "Windows"),
+            executor.submit(_run_collector, ["Detected Languages in Music Folder:"], format_music_folder_analysis, "Linux"),
+            executor.submit(_run_collector, {}, get_ie_history),
+        ]
+    (lang_code, keyboard_layouts, ie_languages, steam_language,
+     music_folder_analysis, ie_history_data) = [future.result() for future in futures]
+    installed_languages = [lang_code] if lang_code else []
+
+    # collect all lines first and write them out at once
+    output = []
+    output.append(f"Operating System: Windows")
+    output.append(f"Language Code: {lang_code}")
+    output.append("Installed Keyboard Layouts:")
     for layout in keyboard_layouts:
-        print(f"  - {layout}")
-    print("Internet Explorer Languages:")
+        output.append(f"  - {layout}")
+    output.append("Internet Explorer Languages:")
     for lang in ie_languages:
-        print(f"  - {lang}")
+        output.append(f"  - {lang}")
     if steam_language:
-        print(f"Steam Language: {steam_language}")
+        output.append(f"Steam Language: {steam_language}")
 
     # check music
-    print_music_folder_analysis("Linux")   
+    output.extend(music_folder_analysis)
 
     human_readable_languages = get_human_readable_languages(installed_languages + ie_languages + ([steam_language] if steam_language else []))
-    print("Installed Languages (Human-readable):")
+    output.append("Installed Languages (Human-readable):")
     for language in human_readable_languages:
-        print(f"  - {language}")
+        output.append(f"  - {language}")
+
+    output.append("Internet Explorer History (Non-.com URLs):")
+    for tld, data in ie_history_data.items():
+        output.append(f"  - {tld} x {data['count']}: {', '.join(data['urls'])}")
 
-    print("Internet Explorer History (Non-.com URLs):")
-    ie_history = get_ie_history()
-    for entry in ie_history:
-        print(f"  - {entry['url']}")
+    sys.stdout.write('\n'.join(output) + '\n')
 
 def print_linux_settings():
     """
     Print language and keyboard settings for Linux.
     """
-    lang_code = get_linux_locale()
-    keyboard_layout = get_linux_keyboard_layout()
-    installed_languages = get_linux_installed_languages()
-    firefox_languages = get_firefox_languages()
-    chrome_languages = get_chrome_languages()
-    steam_language = get_steam_language("Linux")
+    firefox_profiles = list(_iter_firefox_profiles())
+
+    # the collectors are independent and mostly wait on I/O, so run them side by side
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [
+            executor.submit(_run_collector, None, get_linux_locale),
+            executor.submit(_run_collector, "Unknown", get_linux_keyboard_layout),
+            executor.submit(_run_collector, [], get_linux_installed_languages),
+            executor.submit(_run_collector, [], get_firefox_languages, firefox_profiles),
+            executor.submit(_run_collector, [], get_chrome_languages),
+            executor.submit(_run_collector, None, get_steam_language, "Linux"),
+            executor.submit(_run_collector, ["Detected Languages in Music Folder:"], format_music_folder_analysis, "Linux"),
+            executor.submit(_run_collector, {}, get_firefox_history, firefox_profiles),
+            executor.submit(_run_collector, {}, get_chrome_history),
+        ]
+    (lang_code, keyboard_layout, installed_languages, firefox_languages, chrome_languages,
+     steam_language, music_folder_analysis, firefox_history_data, chrome_history_data) = [
+        future.result() for future in futures
+    ]
+
+    # collect all lines first and write them out at once
+    output = []
 
     # print the languages installed in chrome and firefox
-    print("Firefox Languages:")
+    output.append("Firefox Languages:")
     for lang in firefox_languages:
-        print(f"  - {lang}")
-    print("Chrome Languages:")
+        output.append(f"  - {lang}")
+    output.append("Chrome Languages:")
     for lang in chrome_languages:
-        print(f"  - {lang}")
+        output.append(f"  - {lang}")
 
     # print the language found in steam, this one requeres more testing.
     if steam_language:
-        print(f"Steam Language: {steam_language}")
+        output.append(f"Steam Language: {steam_language}")
 
 
      # check music
-    print_music_folder_analysis("Linux")   
+    output.extend(music_folder_analysis)
 
     # retrieve the language codes and make them human readable
     human_readable_languages = get_human_readable_languages(installed_languages + firefox_languages + chrome_languages + ([steam_language] if steam_language else []))
-    print("Installed Languages (Human-readable):")
+    output.append("Installed Languages (Human-readable):")
     for language in human_readable_languages:
-        print(f"  - {language}")
+        output.append(f"  - {language}")
 
     # print the non .com urls with 3 examples from search history
-    print("Firefox History (Non-.com URLs):")
-    firefox_history_data = get_firefox_history()
+    output.append("Firefox History (Non-.com URLs):")
     for tld, data in firefox_history_data.items():
-        print(f"  - {tld} x {data['count']}: {', '.join(data['urls'])}")
+        output.append(f"  - {tld} x {data['count']}: {', '.join(data['urls'])}")
 
     # print the non .com urls with 3 examples from search history
-    print("Chrome History (Non-.com URLs):")
-    chrome_history_data = get_chrome_history()
+    output.append("Chrome History (Non-.com URLs):")
     for tld, data in chrome_history_data.items():
-        print(f"  - {tld} x {data['count']}: {', '.join(data['urls'])}")
+        output.append(f"  - {tld} x {data['count']}: {', '.join(data['urls'])}")
 
     # print general infromation, such as the main installed language and keyboard languages installed
-    print(f"Operating System: Linux")
-    print(f"Language Code: {lang_code}")
-    print(f"Current Keyboard Layout: {keyboard_layout}") 
+    output.append(f"Operating System: Linux")
+    output.append(f"Language Code: {lang_code}")
+    output.append(f"Current Keyboard Layout: {keyboard_layout}") 
+
+    sys.stdout.write('\n'.join(output) + '\n')
  
 
 
-def get_firefox_history():
+def get_firefox_history(firefox_profiles=None):
     """
     Retrieve search history from Firefox and count TLD occurrences.
 
+    Args:
+        firefox_profiles (list, optional): Profile paths from _iter_firefox_profiles,
+            to share one profile scan between callers.
+
     Returns:
         dict: Dictionary with TLDs as keys and another dictionary as values, 
               containing the count and most common base URLs.
     """
-    firefox_profiles_path = os.path.expanduser("~/.mozilla/firefox")
-    history_entries = []
+    if firefox_profiles is None:
+        firefox_profiles = _iter_firefox_profiles()
+    places_db_paths = [path for _, path in firefox_profiles if os.path.isfile(path)]
+    # Profiles whose database could not be read even from a copy
+    skipped_db_paths = []
+
+    def places_query(schema):
+        # One row per visit, as the visits are what gets counted. rev_host holds the
+        # reversed host ("moc.elgoog.www."), so .com hosts are dropped in SQLite
+        # without ever matching a path or query string.
+        return (
+            f"SELECT url FROM {schema}.moz_places, {schema}.moz_historyvisits "
+            f"WHERE {schema}.moz_places.id = {schema}.moz_historyvisits.place_id "
+            f"AND {schema}.moz_places.rev_host NOT LIKE 'moc.%'"
+        )
+
+    def read_places_copy(places_db_path):
+        # A running Firefox can hold an exclusive lock, so read a copy of the
+        # database and its write-ahead log instead
+        with tempfile.TemporaryDirectory() as copy_dir:
+            conn = sqlite3.connect(_copy_database(places_db_path, copy_dir))
+            try:
+                for (url,) in conn.execute(places_query("main")):
+                    yield {"url": url}
+            except sqlite3.DatabaseError:
+                skipped_db_paths.append(places_db_path)  # not a readable places database, skip the profile
+            finally:
+                conn.close()
+
+    def read_firefox_history():
+        locked_db_paths = []
+        # One connection for all profiles; each database is attached to it
+        conn = sqlite3.connect(":memory:", uri=True)
+        try:
+            for start in range(0, len(places_db_paths), _SQLITE_MAX_ATTACHED):
+                schemas = []
+                for places_db_path in places_db_paths[start:start + _SQLITE_MAX_ATTACHED]:
+                    schema = f"places{len(schemas)}"
+                    try:
+                        conn.execute(f"ATTACH DATABASE ? AS {schema}", (_readonly_uri(places_db_path),))
+                    except sqlite3.DatabaseError:
+                        locked_db_paths.append(places_db_path)
+                        continue
+                    try:
+                        # Touch the schema now, so a locked database fails here and not in the query
+                        conn.execute(f"SELECT 1 FROM {schema}.sqlite_master LIMIT 1").fetchall()
+                    except sqlite3.DatabaseError:
+                        conn.execute(f"DETACH DATABASE {schema}")
+                        locked_db_paths.append(places_db_path)
+                        continue
+                    schemas.append(schema)
+
+                if schemas:
+                    for (url,) in conn.execute(" UNION ALL ".join(places_query(schema) for schema in schemas)):
+                        yield {"url": url}
+
+                for schema in schemas:
+                    conn.execute(f"DETACH DATABASE {schema}")
+        finally:
+            conn.close()
 
-    if not os.path.exists(firefox_profiles_path):
-        return {}
+        for places_db_path in locked_db_paths:
+            yield from read_places_copy(places_db_path)
 
-    for profile in os.listdir(firefox_profiles_path):
-        places_db_path = os.path.join(firefox_profiles_path, profile, "places.sqlite")
-        if os.path.isfile(places_db_path):
-            conn = sqlite3.connect(places_db_path)
-            cursor = conn.cursor()
-            cursor.execute("SELECT url, title, visit_date FROM moz_places, moz_historyvisits WHERE moz_places.id = moz_historyvisits.place_id")
-            for row in cursor.fetchall():
-                history_entries.append({
-                    "url": row[0],
-                    "title": row[1],
-                    "visit_date": row[2]
-                })
-            conn.close()
-    return filter_non_com_urls(history_entries)
+    def compute_firefox_history():
+        history_data = filter_non_com_urls(read_firefox_history())
+        return history_data, not skipped_db_paths
+
+    return _cached_history_data("firefox", places_db_paths, compute_firefox_history)
 
 def get_chrome_history():
     """
@@ -445,60 +763,36 @@ def get_chrome_history():
     """
     chrome_profile_path = os.path.expanduser("~/.config/google-chrome/Default")
     history_db_path = os.path.join(chrome_profile_path, "History")
-    history_entries = []
 
     if not os.path.isfile(history_db_path):
         return {}
 
-    shutil.copy2(history_db_path, "/tmp/History")  # Chrome locks the file, so copy it
-    conn = sqlite3.connect("/tmp/History")
-    cursor = conn.cursor()
-    cursor.execute("SELECT url, title, last_visit_time FROM urls")
-    for row in cursor.fetchall():
-        history_entries.append({
-            "url": row[0],
-            "title": row[1],
-            "visit_date": row[2]
-        })
-    conn.close()
-    os.remove("/tmp/History")
-    return filter_non_com_urls(history_entries)
-
-
+    def read_chrome_history(conn):
+        try:
+            cursor = conn.execute("SELECT url FROM urls")
+            return filter_non_com_urls({"url": url} for (url,) in cursor)
+        finally:
+            conn.close()
 
-def detect_language_in_text(text):
-    """
-    Detects the presence of specific language scripts in a given text.
+    def compute_chrome_history():
+        try:
+            return read_chrome_history(_connect_readonly(history_db_path)), True
+        except sqlite3.DatabaseError:
+            # Chrome on Windows opens the file exclusively, and a read taken while Chrome
+            # writes can come out torn, so read a private copy with its journal instead
+            with tempfile.TemporaryDirectory() as copy_dir:
+                return read_chrome_history(sqlite3.connect(_copy_database(history_db_path, copy_dir))), True
 
-    Args:
-        text (str): The text to analyze.
+    return _cached_history_data("chrome", [history_db_path], compute_chrome_history)
 
-    Returns:
-        list: A list of detected languages based on scripts.
-    """
-    scripts = {
-        'Cyrillic': re.compile(r'[\u0400-\u04FF]'),
-        'Arabic': re.compile(r'[\u0600-\u06FF]'),
-        'Chinese': re.compile(r'[\u4E00-\u9FFF]'),
-        'Greek': re.compile(r'[\u0370-\u03FF]'),
-        'Hebrew': re.compile(r'[\u0590-\u05FF]'),
-        'Devanagari': re.compile(r'[\u0900-\u097F]'),
-        'Thai': re.compile(r'[\u0E00-\u0E7F]'),
-        'Hangul': re.compile(r'[\uAC00-\uD7AF]')
-    }
-    
-    detected_languages = []
-    
-    for language, pattern in scripts.items():
-        if pattern.search(text):
-            detected_languages.append(language)
-    
-    return detected_languages
 
 
-def print_music_folder_analysis(os_name):
+def format_music_folder_analysis(os_name):
     """
-    Print analysis of the Music folder for potential language usage.
+    Format an analysis of the Music folder for potential language usage.
+
+    Returns:
+        list: The output lines.
     """
     if os_name == "Windows":
         music_folder = os.path.expandvars(r'%USERPROFILE%\Music')
@@ -506,10 +800,11 @@ def print_music_folder_analysis(os_name):
         music_folder = os.path.expanduser("~/Music")
 
     music_languages = scan_music_folder(music_folder)
-    print("Detected Languages in Music Folder:")
+    output = ["Detected Languages in Music Folder:"]
     for language, data in music_languages.items():
         examples = ', '.join(data["examples"])
-        print(f"  - {language} x {data['count']}: {examples}")
+        output.append(f"  - {language} x {data['count']}: {examples}")
+    return output
 
 
 def scan_music_folder(folder_path):
@@ -528,9 +823,20 @@ def scan_music_folder(folder_path):
         return detected_languages
 
     for root, dirs, files in os.walk(folder_path):
-        for name in dirs + files:
-            languages = detect_language_in_text(name)
-            for language in languages:
+        # ASCII names cannot contain any of the scripts, so skip them up front
+        names = [name for name in dirs + files if not name.isascii()]
+        if not names:
+            continue
+
+        # Scan all names of a directory in one pass; NUL cannot occur in file names
+        blob = '\0'.join(names)
+        name_ends = list(accumulate(len(name) + 1 for name in names))
+        masks = [0] * len(names)
+        for match in _SCRIPT_RUNS_RE.finditer(blob):
+            masks[bisect_right(name_ends, match.start())] |= _script_mask(match.group())
+
+        for name, mask in zip(names, masks):
+            for language in _MASK_LANGUAGES[mask]:
                 detected_languages[language]["count"] += 1
                 if len(detected_languages[language]["examples"]) < 3:
                     detected_languages[language]["examples"].append(name)